@@ -0,0 +1,861 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import select
+import threading
+import argparse
+from pathlib import Path
+
+# Optional: python-xlib lets us talk to X directly instead of spawning helpers.
+# It is imported on first use so commands that never touch X start faster.
+X = Xatom = xdisplay = xfixes = xevent = None
+_xlib_available = None
+
+def _load_xlib():
+    """Import python-xlib once, returning whether it is installed"""
+    global X, Xatom, xdisplay, xfixes, xevent, _xlib_available
+    if _xlib_available is None:
+        try:
+            from Xlib import X, Xatom, display as xdisplay
+            from Xlib.ext import xfixes
+            from Xlib.protocol import event as xevent
+            _xlib_available = True
+        except ImportError:
+            _xlib_available = False
+    return _xlib_available
+
+# xclip command lines, built once
+_XCLIP_GET = ("xclip", "-o", "-selection", "clipboard")
+_XCLIP_SET = ("xclip", "-selection", "clipboard")
+_xclip_resolved = False
+
+def _resolve_xclip():
+    """Swap in xclip's full path once; subprocess only uses posix_spawn for absolute paths"""
+    global _XCLIP_GET, _XCLIP_SET, _xclip_resolved
+    if not _xclip_resolved:
+        import shutil
+        path = shutil.which("xclip")
+        if path:
+            _XCLIP_GET = (path,) + _XCLIP_GET[1:]
+            _XCLIP_SET = (path,) + _XCLIP_SET[1:]
+        _xclip_resolved = True
+
+# ANSI color codes
+RESET = "\033[0m"
+BOLD = "\033[1m"
+RED = "\033[31m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+BLUE = "\033[34m"
+MAGENTA = "\033[35m"
+CYAN = "\033[36m"
+WHITE = "\033[37m"
+
+# ASCII art banner, rendered once at import
+_BANNER = "".join(
+    f"{BOLD}{CYAN}{line}{RESET}\n" for line in (
+        r"  ____ _ _       _                         _  ",
+        r" / ___| (_)_ __ | |__   ___   __ _ _ __ __| | ",
+        r"| |   | | | '_ \| '_ \ / _ \ / _` | '__/ _` | ",
+        r"| |___| | | |_) | |_) | (_) | (_| | | | (_| | ",
+        r" \____|_|_| .__/|_.__/ \___/ \__,_|_|  \__,_| ",
+        r"          |_|                                 ",
+    )
+)
+
+def _atomic_write(path, data):
+    """Replace path with data so readers never see a partially written file"""
+    import tempfile
+    
+    # Write through symlinks (e.g. a dotfiles checkout) instead of replacing them
+    path = path.resolve()
+    
+    # A unique temp file per writer, so concurrent writers can't interleave
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.')
+    try:
+        # mkstemp creates the file 0600; keep the permissions the file already had
+        try:
+            os.fchmod(fd, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        with open(fd, 'wb') as f:
+            f.write(data)
+            if os.environ.get("CLIPMAN_NOFSYNC") != "1":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def _close_display(d):
+    """Close an X connection that may already be broken"""
+    try:
+        d.close()
+    except Exception:
+        pass
+
+class Style:
+    """Escape codes used for output; all empty when color is disabled"""
+    
+    def __init__(self, reset="", bold="", red="", green="", yellow="",
+                 blue="", magenta="", cyan="", white=""):
+        self.reset = reset
+        self.bold = bold
+        self.red = red
+        self.green = green
+        self.yellow = yellow
+        self.blue = blue
+        self.magenta = magenta
+        self.cyan = cyan
+        self.white = white
+    
+    @classmethod
+    def for_mode(cls, mode="auto"):
+        """Build a Style for --color=auto|always|never"""
+        if mode == "auto":
+            use_color = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+        else:
+            use_color = mode == "always"
+        if not use_color:
+            return cls()
+        return cls(RESET, BOLD, RED, GREEN, YELLOW, BLUE, MAGENTA, CYAN, WHITE)
+    
+    @property
+    def enabled(self):
+        return bool(self.reset)
+
+class _SelectionOwner:
+    """Owns the CLIPBOARD selection from a hidden window and answers paste requests"""
+    
+    def __init__(self, content):
+        self.content = content
+        self.display = xdisplay.Display()
+        self.window = self.display.screen().root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        self.atoms = {
+            name: self.display.intern_atom(name)
+            for name in ('CLIPBOARD', 'TARGETS', 'UTF8_STRING', 'TEXT')
+        }
+    
+    def acquire(self):
+        """Take ownership of the clipboard, or return False if that is not possible"""
+        # Content that does not fit in one request needs the INCR protocol
+        max_bytes = (self.display.display.info.max_request_length << 2) - 64
+        if len(self.content) > max_bytes:
+            return False
+        
+        clipboard = self.atoms['CLIPBOARD']
+        self.window.set_selection_owner(clipboard, X.CurrentTime)
+        return self.display.get_selection_owner(clipboard) == self.window
+    
+    def serve(self):
+        """Answer SelectionRequest events until another client takes the clipboard"""
+        while True:
+            event = self.display.next_event()
+            if event.type == X.SelectionClear:
+                return
+            if event.type == X.SelectionRequest:
+                self._answer(event)
+    
+    def _answer(self, request):
+        atoms = self.atoms
+        requestor = request.requestor
+        # Obsolete clients leave the property unset and expect the target name
+        prop = request.property if request.property != X.NONE else request.target
+        
+        if request.target == atoms['TARGETS']:
+            targets = [atoms['TARGETS'], atoms['UTF8_STRING'], atoms['TEXT'], Xatom.STRING]
+            requestor.change_property(prop, Xatom.ATOM, 32, targets)
+        elif request.target in (atoms['UTF8_STRING'], atoms['TEXT']):
+            requestor.change_property(prop, atoms['UTF8_STRING'], 8, self.content)
+        elif request.target == Xatom.STRING:
+            requestor.change_property(prop, Xatom.STRING, 8, self.content)
+        else:
+            prop = X.NONE
+        
+        requestor.send_event(xevent.SelectionNotify(
+            time=request.time, requestor=requestor, selection=request.selection,
+            target=request.target, property=prop
+        ))
+        self.display.flush()
+
+class ClipboardManager:
+    def __init__(self, style=None, max_entry_bytes=1024 * 1024):
+        self.style = style if style is not None else Style.for_mode()
+        self.history_file = Path.home() / ".clipboard_history"
+        self.max_entries = 5
+        self.max_entry_bytes = max_entry_bytes
+        self.separator = "---CLIPBOARD_ENTRY_SEPARATOR---"
+        self._sep_bytes = self.separator.encode('utf-8')
+        
+        # Create history file if it doesn't exist
+        self.history_file.touch(exist_ok=True)
+        
+        # Fingerprint of the newest entry, so unchanged clipboards skip file I/O;
+        # read from the file on the first add rather than on every startup
+        self._last_hash = None
+        self._last_hash_loaded = False
+        
+        # Change notification backends, probed lazily by _arm_watcher
+        self._use_clipnotify = True
+        self._clipnotify = None
+        self._xfixes_display = None
+        
+        # Quiet period after a change before the clipboard is read, so bursts
+        # of copies only record their final value
+        self.debounce = 0.15
+        
+        # Polling fallback backs off while the clipboard is idle
+        self._min_interval = 0.25
+        self._max_interval = self._env_max_interval()
+        self._interval = self._min_interval
+        
+        # Persistent X connection for reading the clipboard, opened on first use
+        self._x = None
+        self._x_window = None
+        self._atoms = {}
+    
+    def _env_max_interval(self, default=8.0):
+        """Read the poll cap from CLIPMAN_MAX_INTERVAL, ignoring values that aren't usable"""
+        try:
+            interval = float(os.environ.get("CLIPMAN_MAX_INTERVAL", default))
+        except ValueError:
+            return default
+        # Below the floor would busy-poll; nan/inf would remove the cap
+        if not self._min_interval <= interval < float('inf'):
+            return default
+        return interval
+    
+    def _open_reader_display(self):
+        """Open an X connection with a hidden window to receive selection data, or return False"""
+        if not _load_xlib():
+            return False
+        try:
+            d = xdisplay.Display()
+        except Exception:
+            return False
+        try:
+            self._x_window = d.screen().root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+            self._atoms = {
+                name: d.intern_atom(name)
+                for name in ('CLIPBOARD', 'UTF8_STRING', 'INCR', '_CLIP_TMP')
+            }
+            return d
+        except Exception:
+            _close_display(d)
+            return False
+    
+    def _get_clipboard_via_xlib(self, timeout=2):
+        """Read the clipboard over the persistent X connection, or None to fall back to xclip"""
+        d = self._x
+        atoms = self._atoms
+        
+        if d.get_selection_owner(atoms['CLIPBOARD']) == X.NONE:
+            return b""
+        
+        # Discard anything left over so only the reply to this request is accepted
+        while d.pending_events():
+            d.next_event()
+        
+        # Ask the owner to convert the selection into a property on our window
+        self._x_window.convert_selection(
+            atoms['CLIPBOARD'], atoms['UTF8_STRING'], atoms['_CLIP_TMP'], X.CurrentTime
+        )
+        d.flush()
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            if not d.pending_events():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([d], [], [], remaining)[0]:
+                    # A late reply would be taken for the next request's, so
+                    # drop this connection and open a fresh one next time
+                    self._x = None
+                    d.close()
+                    return None
+                continue
+            event = d.next_event()
+            if (event.type == X.SelectionNotify and event.selection == atoms['CLIPBOARD']
+                    and event.requestor == self._x_window):
+                break
+        
+        # The owner can't provide UTF8_STRING; xclip falls back to other targets
+        if event.property == X.NONE:
+            return None
+        
+        prop = self._x_window.get_full_property(atoms['_CLIP_TMP'], X.AnyPropertyType)
+        if prop is None:
+            return b""
+        
+        # Large selections use the incremental protocol; leave those to xclip.
+        # Deleting an INCR property tells the owner to start sending chunks,
+        # so only delete it once the data is ours
+        if prop.property_type == atoms['INCR']:
+            return None
+        self._x_window.delete_property(atoms['_CLIP_TMP'])
+        return bytes(prop.value)
+    
+    def _get_clipboard_bytes(self):
+        """Get current clipboard content as raw bytes, without decoding"""
+        if self._x is None:
+            self._x = self._open_reader_display()
+        if self._x:
+            d = self._x
+            try:
+                content = self._get_clipboard_via_xlib()
+                if content is not None:
+                    return content
+            except Exception:
+                # Reconnect on the next call if the X connection dropped
+                self._x = None
+                _close_display(d)
+        
+        import subprocess
+        
+        _resolve_xclip()
+        try:
+            # Our fds are non-inheritable already (PEP 446), so skip the fd sweep
+            result = subprocess.run(
+                _XCLIP_GET, capture_output=True, timeout=2, close_fds=False
+            )
+            return result.stdout if result.returncode == 0 else b""
+        except (subprocess.SubprocessError, OSError):
+            print(f"{self.style.red}Error accessing clipboard{self.style.reset}")
+            return b""
+    
+    def get_clipboard_content(self):
+        """Get current clipboard content safely"""
+        return self._get_clipboard_bytes().decode('utf-8', errors='replace')
+    
+    def _own_selection(self, content):
+        """Serve the clipboard from a forked child that outlives this process, like xclip"""
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                os.close(read_fd)
+                os.setsid()
+                # Detach from the terminal so pipelines don't wait on us
+                devnull = os.open(os.devnull, os.O_RDWR)
+                for fd in (0, 1, 2):
+                    os.dup2(devnull, fd)
+                
+                owner = _SelectionOwner(content)
+                if owner.acquire():
+                    os.write(write_fd, b"1")
+                    os.close(write_fd)
+                    owner.serve()
+                    status = 0
+            finally:
+                os._exit(status)
+        
+        # Parent: wait only until the child reports whether it got the clipboard
+        os.close(write_fd)
+        acquired = os.read(read_fd, 1) == b"1"
+        os.close(read_fd)
+        if not acquired:
+            os.waitpid(pid, 0)
+        return acquired
+    
+    def set_clipboard_content(self, content):
+        """Set clipboard content from str or bytes"""
+        if isinstance(content, str):
+            content = content.encode()
+        
+        if _load_xlib() and self._own_selection(content):
+            return True
+        
+        import subprocess
+        
+        _resolve_xclip()
+        try:
+            process = subprocess.Popen(
+                _XCLIP_SET, stdin=subprocess.PIPE, close_fds=False
+            )
+            process.communicate(input=content)
+            return process.returncode == 0
+        except (subprocess.SubprocessError, OSError):
+            print(f"{self.style.red}Error setting clipboard{self.style.reset}")
+            return False
+    
+    def _open_xfixes_display(self):
+        """Open an X connection subscribed to clipboard owner changes, or return False"""
+        if not _load_xlib():
+            return False
+        try:
+            d = xdisplay.Display()
+        except Exception:
+            return False
+        try:
+            if not d.has_extension('XFIXES'):
+                d.close()
+                return False
+            d.xfixes_query_version()
+            d.xfixes_select_selection_input(
+                d.screen().root, d.intern_atom('CLIPBOARD'),
+                xfixes.XFixesSetSelectionOwnerNotifyMask
+            )
+            return d
+        except Exception:
+            _close_display(d)
+            return False
+    
+    def _arm_watcher(self):
+        """Start watching for clipboard changes; call before reading so none are missed"""
+        # Prefer XFIXES: its subscription persists, clipnotify has to be restarted
+        if self._xfixes_display is None:
+            self._xfixes_display = self._open_xfixes_display()
+        if self._xfixes_display or not self._use_clipnotify or self._clipnotify is not None:
+            return
+        import subprocess
+        try:
+            self._clipnotify = subprocess.Popen(["clipnotify", "-s", "clipboard"])
+        except FileNotFoundError:
+            self._use_clipnotify = False
+    
+    def _wait_for_change(self, timeout=None):
+        """Block until the clipboard changes, falling back to an adaptive poll
+        
+        With a timeout, return False if nothing changed within that many seconds.
+        """
+        self._arm_watcher()
+        
+        # XFIXES events queue on our connection, so none are lost between waits
+        if self._xfixes_display:
+            d = self._xfixes_display
+            try:
+                if timeout is not None and not d.pending_events():
+                    if not select.select([d], [], [], timeout)[0]:
+                        return False
+                d.next_event()
+            except Exception:
+                # Reconnect on the next call if the X connection dropped
+                self._xfixes_display = None
+                _close_display(d)
+                raise
+            return True
+        
+        # clipnotify exits on the first owner change after it was started
+        if self._clipnotify is not None:
+            import subprocess
+            try:
+                returncode = self._clipnotify.wait(timeout)
+            except subprocess.TimeoutExpired:
+                # Still running, so it stays armed for the next wait
+                return False
+            self._clipnotify = None
+            if returncode == 0:
+                return True
+            self._use_clipnotify = False
+        
+        # Polling can't tell a burst apart, so there is nothing to wait out
+        if timeout is not None:
+            return False
+        
+        # Double the poll interval after every idle wakeup, up to the cap
+        time.sleep(self._interval)
+        self._interval = min(self._interval * 2, self._max_interval)
+        return True
+    
+    def _hash_entry(self, entry):
+        """Fingerprint an entry the same way entries are compared (ignoring surrounding whitespace)"""
+        import hashlib
+        return hashlib.blake2b(entry.strip(), digest_size=16).digest()
+    
+    def _read_head_hash(self):
+        """Hash the most recent history entry, or None if the history is empty"""
+        import mmap
+        try:
+            with open(self.history_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                # Slice out just the head entry instead of reading the whole file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = mm.find(self._sep_bytes)
+                    head = mm[:end if end != -1 else len(mm)]
+        except Exception:
+            return None
+        return self._hash_entry(head) if head.strip() else None
+    
+    def _truncate_entry(self, content):
+        """Cut content down to max_entry_bytes, marking that it was truncated"""
+        if len(content) <= self.max_entry_bytes:
+            return content
+        marker = b"\n...[truncated]"
+        cut = max(self.max_entry_bytes - len(marker), 0)
+        # Don't split a UTF-8 sequence
+        while cut > 0 and content[cut] & 0xC0 == 0x80:
+            cut -= 1
+        return content[:cut] + marker
+    
+    def add_to_history(self, content=None, known_last=None):
+        """Add clipboard bytes to history, reading the clipboard if content is not given"""
+        if content is None:
+            content = self._get_clipboard_bytes()
+        
+        # Skip if empty
+        if not content:
+            return False
+        
+        # Skip if the caller already saw this content last time
+        if known_last is not None and content == known_last:
+            return False
+        
+        # Cap huge pastes so they can't bloat the history file
+        content = self._truncate_entry(content)
+        
+        # Skip if it matches the newest entry we already know about
+        if not self._last_hash_loaded:
+            self._last_hash = self._read_head_hash()
+            self._last_hash_loaded = True
+        content_hash = self._hash_entry(content)
+        if content_hash == self._last_hash:
+            return False
+            
+        # Read current history
+        try:
+            with open(self.history_file, 'rb') as f:
+                history = f.read()
+        except Exception:
+            history = b""
+            
+        # Check if content is same as most recent entry; splitting stops at
+        # the trim point and nothing is decoded
+        entries = history.split(self._sep_bytes, self.max_entries)
+        if entries and entries[0].strip() == content.strip():
+            self._last_hash = content_hash
+            return False
+            
+        # Add new entry at beginning and drop the oldest in the same write,
+        # so the file never needs a separate trim pass
+        kept = self._sep_bytes.join(entries[:self.max_entries - 1])
+        _atomic_write(self.history_file, content + b"\n" + self._sep_bytes + b"\n" + kept)
+        self._last_hash = content_hash
+        return True
+    
+    def trim_history(self):
+        """Keep only max_entries in history file"""
+        import mmap
+        try:
+            with open(self.history_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return
+                
+                # Find where the oldest kept entry ends and keep only what's before it
+                sep = self._sep_bytes
+                cut = -len(sep)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for _ in range(self.max_entries):
+                        cut = mm.find(sep, cut + len(sep))
+                        if cut == -1:
+                            return
+                    kept = mm[:cut]
+            _atomic_write(self.history_file, kept)
+            print(f"{self.style.green}Clipboard history trimmed to {self.max_entries} entries.{self.style.reset}")
+        except Exception as e:
+            print(f"{self.style.red}Error trimming history: {e}{self.style.reset}")
+    
+    def clear_history(self):
+        """Clear the clipboard history"""
+        try:
+            _atomic_write(self.history_file, b"")
+            self._last_hash = None
+            print(f"{self.style.green}Clipboard history cleared.{self.style.reset}")
+            return True
+        except Exception as e:
+            print(f"{self.style.red}Error clearing history: {e}{self.style.reset}")
+            return False
+    
+    def _entry_spans(self, mm):
+        """Yield (start, end) byte offsets of the non-blank entries in a mapped history file"""
+        sep = self._sep_bytes
+        whitespace = b" \t\n\r\x0b\x0c"
+        start = 0
+        while start <= len(mm):
+            end = mm.find(sep, start)
+            if end == -1:
+                end = len(mm)
+            
+            # Strip surrounding whitespace by moving the offsets, not copying
+            first, last = start, end
+            while first < last and mm[first] in whitespace:
+                first += 1
+            while last > first and mm[last - 1] in whitespace:
+                last -= 1
+            if first < last:
+                yield first, last
+            start = end + len(sep)
+    
+    def _read_entry(self, mm, span):
+        """Decode one full history entry from the mapped history file"""
+        start, end = span
+        return mm[start:end].decode('utf-8', errors='replace')
+    
+    def _enable_menu_completion(self, count):
+        """Tab-complete entry numbers and menu commands at the prompt, where readline exists"""
+        try:
+            import readline
+        except ImportError:
+            return
+        options = [str(i) for i in range(1, count + 1)] + ['p', 'c', 'q']
+        
+        def complete(text, state):
+            matches = [o for o in options if o.startswith(text)]
+            return matches[state] if state < len(matches) else None
+        
+        readline.set_completer(complete)
+        readline.parse_and_bind('tab: complete')
+    
+    def show_history(self):
+        """Show history with a simple numbered menu and copy selection to clipboard"""
+        import mmap
+        
+        style = self.style
+        mm = None
+        try:
+            # Display ASCII art banner
+            if style.enabled:
+                sys.stdout.write(_BANNER)
+                sys.stdout.write(f"{style.bold}{style.green}History Mode{style.reset}\n")
+                sys.stdout.flush()
+                
+            with open(self.history_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    print(f"\n{style.yellow}Clipboard history is empty{style.reset}")
+                    return
+                # Map the file so only the bytes we display ever get decoded
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                
+            # Process the entries
+            display_entries = []
+            full_entries = []
+            
+            for start, end in self._entry_spans(mm):
+                # Get just the first line for display
+                newline = mm.find(b"\n", start, end)
+                line_end = end if newline == -1 else newline
+                first_line = mm[start:min(line_end, start + 256)].decode('utf-8', errors='replace')
+                
+                # Truncate if first line is too long
+                if len(first_line) > 60:
+                    first_line = first_line[:57] + "..."
+                
+                # Add indicator if multiline
+                if newline != -1:
+                    first_line += f" {style.blue}[...]{style.reset}"
+                    
+                display_entries.append(first_line)
+                full_entries.append((start, end))
+            
+            if not display_entries:
+                print(f"{style.yellow}No valid entries in clipboard history{style.reset}")
+                return
+            
+            # Render the numbered menu once; redrawing it is then a single write
+            menu = "".join([
+                f"\n{style.cyan}=== {style.bold}Clipboard History{style.reset} {style.cyan}==={style.reset}\n",
+                *(f"{style.yellow}{i}{style.reset}. {item}\n" for i, item in enumerate(display_entries, 1)),
+                f"\n{style.cyan}=== {style.bold}Options{style.reset} {style.cyan}==={style.reset}\n",
+                f"{style.bold}Enter a number{style.reset} to copy to clipboard\n",
+                f"'{style.bold}p{style.reset}' to preview an entry\n",
+                f"'{style.bold}c{style.reset}' to clear history\n",
+                f"'{style.bold}q{style.reset}' to quit\n",
+            ])
+            self._enable_menu_completion(len(display_entries))
+            
+            while True:
+                sys.stdout.write(menu)
+                
+                choice = input(f"\n{style.cyan}>{style.reset} ").strip().lower()
+                
+                if choice == 'q':
+                    return
+                elif choice == 'c':
+                    # Clear history confirmation
+                    confirm = input(f"{style.yellow}Are you sure you want to clear clipboard history? (y/n):{style.reset} ").strip().lower()
+                    if confirm == 'y' or confirm == 'yes':
+                        if self.clear_history():
+                            return  # Exit after clearing
+                elif choice == 'p':
+                    # Preview mode
+                    preview_num = input(f"{style.cyan}Enter number to preview:{style.reset} ").strip()
+                    try:
+                        preview_index = int(preview_num) - 1
+                        if 0 <= preview_index < len(full_entries):
+                            entry = self._read_entry(mm, full_entries[preview_index])
+                            print(f"\n{style.cyan}=== {style.bold}Preview{style.reset} {style.cyan}==={style.reset}")
+                            preview_lines = entry.split('\n')[:10]  # Limit to 10 lines
+                            for line in preview_lines:
+                                print(line)
+                                
+                            if len(preview_lines) < entry.count('\n') + 1:
+                                print(f"\n{style.yellow}(Content truncated...){style.reset}")
+                                
+                            input(f"\n{style.blue}Press Enter to continue{style.reset}")
+                        else:
+                            print(f"{style.red}Invalid number{style.reset}")
+                            input(f"{style.blue}Press Enter to continue{style.reset}")
+                    except ValueError:
+                        print(f"{style.red}Please enter a valid number{style.reset}")
+                        input(f"{style.blue}Press Enter to continue{style.reset}")
+                else:
+                    # Selection mode
+                    try:
+                        index = int(choice) - 1
+                        if 0 <= index < len(full_entries):
+                            start, end = full_entries[index]
+                            selected = mm[start:end]
+                            if self.set_clipboard_content(selected):
+                                print(f"{style.green}Copied to clipboard!{style.reset}")
+                                return
+                        else:
+                            print(f"{style.red}Invalid number{style.reset}")
+                    except ValueError:
+                        print(f"{style.red}Please enter a valid number, 'p', 'c', or 'q'{style.reset}")
+                
+        except Exception as e:
+            print(f"{style.red}Error showing history: {e}{style.reset}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            if mm is not None:
+                mm.close()
+    
+    def _spin(self, stop):
+        """Animate the monitoring status line every 100ms until stop is set"""
+        style = self.style
+        spinner = ['-', '\\', '|', '/']
+        spin_idx = 0
+        while not stop.wait(0.1):
+            sys.stdout.write(f"\r{style.cyan}Monitoring clipboard {spinner[spin_idx]}{style.reset}")
+            sys.stdout.flush()
+            spin_idx = (spin_idx + 1) % len(spinner)
+    
+    def monitor(self):
+        """Monitor clipboard for changes and add to history"""
+        style = self.style
+        last_content = b""
+        
+        # Draw ASCII art banner
+        if style.enabled:
+            sys.stdout.write(_BANNER)
+            sys.stdout.write(f"{style.bold}{style.green}Monitor Mode{style.reset}\n")
+            sys.stdout.flush()
+        
+        print(f"\n{style.yellow}Starting clipboard monitor...{style.reset}")
+        
+        # Log to file for debugging; one line-buffered handle for the whole run
+        log_file = Path.home() / ".clipboard_monitor.log"
+        self._log = open(log_file, 'a', buffering=1)
+        self._log.write(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] Monitor started\n")
+        
+        # Test clipboard access at startup
+        try:
+            test_content = self._get_clipboard_bytes()
+            self._log.write(f"Initial clipboard test: {'Success' if test_content is not None else 'Failed'}\n")
+        except Exception as e:
+            self._log.write(f"Error testing clipboard: {str(e)}\n")
+        
+        # The main loop blocks on clipboard events, so animate from a thread
+        spinner_stop = threading.Event()
+        if style.enabled:
+            threading.Thread(target=self._spin, args=(spinner_stop,), daemon=True).start()
+        else:
+            print("Monitoring clipboard...")
+        
+        retry_count = 0
+        max_retries = 5
+        
+        try:
+            while True:
+                try:
+                    # Arm change detection first so a copy made while we
+                    # read and write history still wakes the next wait
+                    self._arm_watcher()
+                    current_content = self._get_clipboard_bytes()
+                    
+                    # Reset retry count on successful clipboard access
+                    retry_count = 0
+                    
+                    if self.add_to_history(current_content, known_last=last_content):
+                        self._interval = self._min_interval
+                        timestamp = time.strftime('%H:%M:%S')
+                        print(f"\r{style.green}Clipboard updated at {timestamp}{style.reset}        ")
+                        self._log.write(f"[{timestamp}] Clipboard updated\n")
+                    if current_content:
+                        last_content = current_content
+                    
+                    # Sleep until the clipboard owner changes, then wait for
+                    # a quiet period so only the last copy of a burst is kept
+                    self._wait_for_change()
+                    while self._wait_for_change(timeout=self.debounce):
+                        pass
+                except Exception as e:
+                    retry_count += 1
+                    self._log.write(f"[{time.strftime('%H:%M:%S')}] Error: {str(e)}\n")
+                    
+                    if retry_count >= max_retries:
+                        print(f"\n{style.red}Too many errors ({retry_count}), exiting{style.reset}")
+                        self._log.write(f"Too many errors ({retry_count}), exiting\n")
+                        break
+                        
+                    # Wait longer between retries
+                    time.sleep(5)
+        except KeyboardInterrupt:
+            print(f"\n{style.yellow}Stopping clipboard monitor.{style.reset}")
+            self._log.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Monitor stopped by user\n")
+        finally:
+            spinner_stop.set()
+            if self._clipnotify is not None:
+                self._clipnotify.kill()
+                self._clipnotify.wait()
+                self._clipnotify = None
+            self._log.close()
+
+
+def _positive_mb(value):
+    """argparse type for --max-entry-mb: a positive size in MiB"""
+    try:
+        mb = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {value!r}")
+    # Also rejects nan/inf, and sizes too small to hold the truncation marker
+    if not 1 / 1024 <= mb < float('inf'):
+        raise argparse.ArgumentTypeError("must be a size of at least 1 KiB (0.001)")
+    return mb
+
+def main(argv=None):
+    # Output options are accepted before or after the action
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--color', choices=['auto', 'always', 'never'], default=argparse.SUPPRESS,
+                        help='Colorize output (default: auto, honours NO_COLOR)')
+    common.add_argument('--no-color', dest='color', action='store_const', const='never',
+                        default=argparse.SUPPRESS, help='Same as --color=never')
+    common.add_argument('--max-entry-mb', type=_positive_mb, default=argparse.SUPPRESS,
+                        help='Truncate clipboard entries larger than this many MiB (default: 1)')
+    
+    # Defaults are applied after parsing: the option actions are shared with
+    # the subparsers, so defaults set here would overwrite earlier values
+    parser = argparse.ArgumentParser(description="Clipboard Manager", parents=[common])
+    actions = parser.add_subparsers(dest='action', metavar='action', required=True,
+                                    help='Action to perform')
+    for name, func, help_text in (
+        ('add', ClipboardManager.add_to_history, 'Add the current clipboard to history'),
+        ('show', ClipboardManager.show_history, 'Pick an entry from history'),
+        ('monitor', ClipboardManager.monitor, 'Watch the clipboard and record changes'),
+        ('clear', ClipboardManager.clear_history, 'Clear the history'),
+        ('trim', ClipboardManager.trim_history, 'Drop entries beyond the history limit'),
+    ):
+        actions.add_parser(name, parents=[common], help=help_text).set_defaults(func=func)
+    
+    args = parser.parse_args(argv)
+    manager = ClipboardManager(
+        Style.for_mode(getattr(args, 'color', 'auto')),
+        max_entry_bytes=int(getattr(args, 'max_entry_mb', 1.0) * 1024 * 1024),
+    )
+    args.func(manager)
+
+if __name__ == "__main__":
+    main()